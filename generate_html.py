@@ -10,10 +10,32 @@ import json
 import os
 import sys
 import argparse
+import gzip
+import hashlib
+import re
+import heapq
+from bisect import bisect_right
 from datetime import datetime
+from html import escape
+from functools import lru_cache
+from operator import itemgetter
+from urllib.parse import quote_plus
+
+try:
+    import orjson  # 可选: 更快的 JSON 解析
+except ImportError:
+    orjson = None
 
 # 使用当前工作目录
 ROOT_DIR = os.getcwd()
+_LATEST_PATH = os.path.join(ROOT_DIR, "latest.json")
+_INDEX_PATH = os.path.join(ROOT_DIR, "index.html")
+# 64KB 写缓冲: 整页 (~15-30KB) 只需一次 write 系统调用
+_WRITE_BUFFER_SIZE = 64 * 1024
+
+_HF_BASE_URL = "https://huggingface.co/"
+_HF_SEARCH_PREFIX = _HF_BASE_URL + "models?search="
+_HF_PIPELINE_TAG_PREFIX = _HF_BASE_URL + "models?pipeline_tag="
 
 HF_TAG_MAP = {
     "语言模型": "text-generation",
@@ -27,276 +49,344 @@ HF_TAG_MAP = {
     "图像理解": "image-classification"
 }
 
-def load_data(requested_date=None):
-    # 如果指定了日期，优先加载对应的数据文件
+_CATEGORY_COLORS = {
+    "语言模型": "#6366f1", "多模态模型": "#14b8a6", "图像生成": "#3b82f6",
+    "语音合成": "#f59e0b", "语音识别": "#a855f7", "其他": "#6b7280"
+}
+_DEFAULT_CATEGORY_COLOR = "#6b7280"
+
+# 技术领域 -> (HF 分类页链接, 标签颜色)，链接在导入时拼好，每行只需一次查找
+_CAT_INFO = {
+    cat: (
+        _HF_PIPELINE_TAG_PREFIX + HF_TAG_MAP[cat] if cat in HF_TAG_MAP else "#",
+        _CATEGORY_COLORS.get(cat, _DEFAULT_CATEGORY_COLOR),
+    )
+    for cat in {**HF_TAG_MAP, **_CATEGORY_COLORS}
+}
+_DEFAULT_CAT_INFO = ("#", _DEFAULT_CATEGORY_COLOR)
+
+# 前三名使用奖牌图标
+_RANK_ICONS = ("🥇", "🥈", "🥉")
+
+# 词云热度分级: 阈值占最高热度的比例 (升序) 与对应样式类
+_KEYWORD_HEAT_RATIOS = (0.2, 0.4, 0.7)
+_KEYWORD_HEAT_CLASSES = ("kw-normal", "kw-medium", "kw-warm", "kw-hot")
+_second = itemgetter(1)
+
+# HTML 片段模板 (与页面模板一样只在导入时构建一次)
+_ROW_TEMPLATE = """
+            <tr>
+                <td class="rank">{rank_icon}</td>
+                <td class="model-name"><a href="{model_url}" target="_blank" style="text-decoration:none; color:#333; font-weight:600;">{name}</a></td>
+                <td><a href="{cat_url}" target="_blank" style="text-decoration:none;"><span class="category-tag" style="background-color: {cat_color}">{category}</span></a></td>
+                <td class="downloads">{downloads_str}</td>
+                <td class="likes">{likes}</td>
+                <td class="author"><a href="{author_url}" target="_blank" style="text-decoration:none; color:#888;">{author}</a></td>
+            </tr>
+        """
+_KEYWORD_LINK_TEMPLATE = '<a href="{url}" target="_blank" class="{css_class}">{keyword}</a>'
+_TAG_LINK_TEMPLATE = '<a href="{url}" target="_blank" style="text-decoration:none; display:inline-block; margin:5px 10px; font-size:{font_size:.2f}rem; color:#6366f1; font-weight:bold;">{tech}</a> '
+_ARCHIVE_ITEM_TEMPLATE = '<li style="padding: 8px 0; border-bottom: 1px solid #eee;"><a href="{html_file}" target="_blank" style="color: #667eea; text-decoration: none;">{date_str}</a></li>\n'
+
+@lru_cache(maxsize=256)
+def _fmt_downloads(n):
+    scale, unit = (1e6, "M") if n >= 1e6 else (1000, "K")
+    return f"{n/scale:.1f}{unit}"
+
+def _read_bytes(filepath):
+    with open(filepath, 'rb') as f:
+        return f.read()
+
+def _parse_json(raw):
+    # 解析器直接处理 UTF-8 字节
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+def _read_json(filepath):
+    return _parse_json(_read_bytes(filepath))
+
+@lru_cache(maxsize=1)
+def _list_hf_data_files():
+    """单次扫描根目录，返回 hf_data_*.json 文件名 (目录顺序，同一进程内只扫描一次)"""
+    with os.scandir(ROOT_DIR) as entries:
+        return tuple(e.name for e in entries if e.name.startswith("hf_data_") and e.name.endswith(".json"))
+
+def resolve_data_path(requested_date=None, hf_files=None):
+    # 如果指定了日期，优先使用对应的数据文件
     if requested_date:
         date_file = f"hf_data_{requested_date}.json"
         filepath = os.path.join(ROOT_DIR, date_file)
         if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return filepath
     
-    latest_path = os.path.join(ROOT_DIR, "latest.json")
-    if os.path.exists(latest_path):
-        with open(latest_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+    if os.path.exists(_LATEST_PATH):
+        return _LATEST_PATH
     
-    files = [f for f in os.listdir(ROOT_DIR) if f.startswith("hf_data_") and f.endswith(".json")]
+    files = hf_files if hf_files is not None else _list_hf_data_files()
     if files:
-        filepath = os.path.join(ROOT_DIR, sorted(files)[-1])
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # 文件名中的日期按字典序即按时间排序
+        return os.path.join(ROOT_DIR, max(files))
     return None
 
+def load_data(requested_date=None):
+    filepath = resolve_data_path(requested_date)
+    return _read_json(filepath) if filepath else None
+
+def _recent_data_files(files, n=7):
+    """最近 n 个数据文件 (按日期升序)，无需对整个目录排序"""
+    return tuple(reversed(heapq.nlargest(n, files)))
+
+def source_cache_key(raw, recent_files=(), gzip_output=False):
+    """页面缓存键: 数据内容、归档列表、是否输出 gzip 与本脚本内容的 blake2b 摘要
+    只依赖内容而非修改时间，git checkout 之后依然有效"""
+    h = hashlib.blake2b(raw, digest_size=16)
+    for name in recent_files:
+        h.update(b"\0" + name.encode('utf-8'))
+    h.update(b"\0gzip" if gzip_output else b"\0plain")
+    h.update(_read_bytes(os.path.abspath(__file__)))
+    return h.hexdigest()
+
+def _read_cache_key(output_path):
+    try:
+        with open(output_path + ".cachekey", 'r', encoding='utf-8') as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+def _output_path(output_name):
+    return _INDEX_PATH if output_name == "index.html" else os.path.join(ROOT_DIR, output_name)
+
+def is_up_to_date(output_path, cache_key, gzip_output=False):
+    """数据文件未变化且页面 (需要时连同 .gz) 已存在时返回 True"""
+    if not cache_key or not os.path.exists(output_path):
+        return False
+    if gzip_output and not os.path.exists(output_path + ".gz"):
+        return False
+    return _read_cache_key(output_path) == cache_key
+
+def _write_cache_key(output_path, cache_key):
+    _atomic_write(output_path + ".cachekey", [(cache_key + "\n").encode('utf-8')])
+
+def _atomic_write(path, chunks):
+    # 先写临时文件再替换，读取方不会看到写了一半的文件
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb', buffering=_WRITE_BUFFER_SIZE) as f:
+        f.writelines(chunks)
+    os.replace(tmp_path, path)
+
 # ========== 新增: 生成精美交互式词云 HTML ==========
 def generate_keyword_cloud_html(tech_keywords: dict) -> str:
     """根据技术关键字热度生成精美交互式词云 HTML"""
     if not tech_keywords:
         return '<p style="color:#999; text-align:center;">暂无技术关键字数据</p>'
+    # 按热度取前30个 (最多显示30个)，结果元组同时作为缓存键
+    top_keywords = tuple(heapq.nlargest(30, tech_keywords.items(), key=_second))
+    return _generate_keyword_cloud_html_cached(top_keywords)
+
+@lru_cache(maxsize=32)
+def _generate_keyword_cloud_html_cached(sorted_keywords: tuple) -> str:
+    max_count = sorted_keywords[0][1]
     
-    # 按热度排序
-    sorted_keywords = sorted(tech_keywords.items(), key=lambda x: x[1], reverse=True)
-    max_count = max(tech_keywords.values()) if tech_keywords else 1
-    
-    # 分级阈值
-    hot_threshold = max_count * 0.7      # 超热门
-    warm_threshold = max_count * 0.4     # 热门
-    medium_threshold = max_count * 0.2   # 上升中
+    # 分级阈值 (升序): 上升中 / 热门 / 超热门
+    thresholds = [max_count * ratio for ratio in _KEYWORD_HEAT_RATIOS]
     
     cloud_items = []
-    for keyword, count in sorted_keywords[:30]:  # 最多显示30个
+    for keyword, count in sorted_keywords:
         # 生成搜索链接
-        url = f"https://huggingface.co/models?search={keyword}"
+        url = _HF_SEARCH_PREFIX + quote_plus(keyword)
         
-        # 根据热度分配样式类
-        if count >= hot_threshold:
-            css_class = "kw-hot"
-        elif count >= warm_threshold:
-            css_class = "kw-warm"
-        elif count >= medium_threshold:
-            css_class = "kw-medium"
-        else:
-            css_class = "kw-normal"
+        # 根据热度分配样式类: 二分查找落在哪个区间
+        css_class = _KEYWORD_HEAT_CLASSES[bisect_right(thresholds, count)]
         
-        cloud_items.append(f'<a href="{url}" target="_blank" class="{css_class}">{keyword}</a>')
+        cloud_items.append(_KEYWORD_LINK_TEMPLATE.format(url=escape(url), css_class=css_class, keyword=escape(keyword)))
     
     return '\n'.join(cloud_items)
 
-def generate_html(data, output_name="index.html"):
-    date = data.get("date", datetime.now().strftime("%Y-%m-%d"))
-    trending = data.get("trending_models", [])[:10]
-    tech_dist = data.get("statistics", {}).get("tech_distribution", {})
-    tech_keywords = data.get("statistics", {}).get("tech_keywords", {})  # 新增
-    
-    total_models = len(data.get("trending_models", [])) + len(data.get("most_downloaded", [])) + len(data.get("most_liked", []))
-    tech_count = len(tech_dist)
-    llm_ratio = tech_dist.get("语言模型", 0) / sum(tech_dist.values()) * 100 if tech_dist and sum(tech_dist.values()) > 0 else 0
-    
-    archive_links = ""
-    files = sorted([f for f in os.listdir(ROOT_DIR) if f.startswith("hf_data_") and f.endswith(".json")])
-    for filename in files[-7:]:
+@lru_cache(maxsize=8)
+def _render_archive_links(recent_files: tuple) -> str:
+    """渲染最近 7 天的历史归档列表，文件列表不变时直接复用"""
+    if not recent_files:
+        return '<li style="padding: 8px 0; color: #999;">暂无历史数据</li>'
+    archive_items = []
+    for filename in recent_files:
         date_str = filename.replace("hf_data_", "").replace(".json", "")
         html_file = f"hf_data_{date_str}.html"
-        archive_links += f'<li style="padding: 8px 0; border-bottom: 1px solid #eee;"><a href="{html_file}" target="_blank" style="color: #667eea; text-decoration: none;">{date_str}</a></li>\n'
-    
-    if not archive_links:
-        archive_links = '<li style="padding: 8px 0; color: #999;">暂无历史数据</li>' 
+        archive_items.append(_ARCHIVE_ITEM_TEMPLATE.format(html_file=html_file, date_str=date_str))
+    return "".join(archive_items)
+
+def _row_context(i, model):
+    """预先算好表格一行所需的全部字段 (图标、链接、颜色、格式化数字)，模板只做纯文本替换"""
+    rank_icon = _RANK_ICONS[i - 1] if i <= 3 else str(i)
+    full_id = model.get("id", "")
+    category = model.get("tech_category", "其他")
+    author = model.get("author", "unknown")
+    cat_url, cat_color = _CAT_INFO.get(category, _DEFAULT_CAT_INFO)
     
-    # 生成交互式标签云 (技术领域分类)
-    tag_cloud_html = ""
-    if tech_dist:
-        max_count = max(tech_dist.values())
-        for tech, count in sorted(tech_dist.items(), key=lambda x: x[1], reverse=True):
-            tag = HF_TAG_MAP.get(tech, "")
-            url = f"https://huggingface.co/models?pipeline_tag={tag}" if tag else "#"
-            font_size = 0.8 + (count / max_count) * 1.0
-            tag_cloud_html += f'<a href="{url}" target="_blank" style="text-decoration:none; display:inline-block; margin:5px 10px; font-size:{font_size:.2f}rem; color:#6366f1; font-weight:bold;">{tech}</a> '
+    # 植入超链接；模型名/作者等来自外部数据，插入页面前统一转义
+    return {
+        "rank_icon": rank_icon,
+        "model_url": escape(model.get("url") or _HF_BASE_URL + full_id),
+        "name": escape(full_id.split("/")[-1]),
+        "cat_url": cat_url,
+        "cat_color": cat_color,
+        "category": escape(category),
+        "downloads_str": _fmt_downloads(model.get("downloads", 0)),
+        "likes": model.get("likes", 0),
+        "author_url": escape(model.get("author_url") or _HF_BASE_URL + str(author)),
+        "author": escape(str(author)),
+    }
 
-    # ========== 新增: 生成精美技术关键字词云 ==========
-    keyword_cloud_html = generate_keyword_cloud_html(tech_keywords)
+def _render_row(i, model):
+    """渲染今日热榜表格中的一行"""
+    return _ROW_TEMPLATE.format_map(_row_context(i, model))
 
-    table_rows = ""
-    for i, model in enumerate(trending, 1):
-        rank_icon = "🥇" if i == 1 else "🥈" if i == 2 else "🥉" if i == 3 else str(i)
-        full_id = model.get("id", "")
-        name = full_id.split("/")[-1]
-        category = model.get("tech_category", "其他")
-        downloads = model.get("downloads", 0)
-        likes = model.get("likes", 0)
-        author = model.get("author", "unknown")
-        
-        # 植入超链接
-        model_url = model.get("url", f"https://huggingface.co/{full_id}")
-        author_url = model.get("author_url", f"https://huggingface.co/{author}")
-        cat_tag = HF_TAG_MAP.get(category, "")
-        cat_url = f"https://huggingface.co/models?pipeline_tag={cat_tag}" if cat_tag else "#"
-        
-        downloads_str = f"{downloads/1000:.1f}K" if downloads < 1e6 else f"{downloads/1e6:.1f}M"
-        
-        category_colors = {
-            "语言模型": "#6366f1", "多模态模型": "#14b8a6", "图像生成": "#3b82f6",
-            "语音合成": "#f59e0b", "语音识别": "#a855f7", "其他": "#6b7280"
-        }
-        cat_color = category_colors.get(category, "#6b7280")
-        
-        table_rows += f"""
-            <tr>
-                <td class="rank">{rank_icon}</td>
-                <td class="model-name"><a href="{model_url}" target="_blank" style="text-decoration:none; color:#333; font-weight:600;">{name}</a></td>
-                <td><a href="{cat_url}" target="_blank" style="text-decoration:none;"><span class="category-tag" style="background-color: {cat_color}">{category}</span></a></td>
-                <td class="downloads">{downloads_str}</td>
-                <td class="likes">{likes}</td>
-                <td class="author"><a href="{author_url}" target="_blank" style="text-decoration:none; color:#888;">{author}</a></td>
-            </tr>
-        """
-    
-    html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>HF 热榜日报 - Hugging Face 热门 AI 技术分析</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
+def _minify_css(css):
+    """去掉注释与多余空白 (仅在导入时调用一次)"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{}:;,])\s*", r"\1", css).strip()
+
+# 页面样式 (保持可读的源码形式，导入时压缩一次)
+_CSS = """
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'PingFang SC', 'Microsoft YaHei', sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
-        .container {{ max-width: 1200px; margin: 0 auto; }}
-        .header {{
+        }
+        .container { max-width: 1200px; margin: 0 auto; }
+        .header {
             text-align: center;
             color: white;
             padding: 40px 20px;
-        }}
-        .header h1 {{ font-size: 2.5rem; margin-bottom: 10px; }}
-        .header p {{ font-size: 1.1rem; opacity: 0.9; }}
-        .date-badge {{
+        }
+        .header h1 { font-size: 2.5rem; margin-bottom: 10px; }
+        .header p { font-size: 1.1rem; opacity: 0.9; }
+        .date-badge {
             display: inline-block;
             background: rgba(255,255,255,0.2);
             padding: 8px 20px;
             border-radius: 20px;
             margin-top: 15px;
             font-size: 0.9rem;
-        }}
-        .stats-grid {{
+        }
+        .stats-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin: 30px 0;
-        }}
-        .stat-card {{
+        }
+        .stat-card {
             background: white;
             border-radius: 16px;
             padding: 25px;
             text-align: center;
             box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-        .stat-card .number {{
+        }
+        .stat-card .number {
             font-size: 2.5rem;
             font-weight: bold;
             color: #667eea;
-        }}
-        .stat-card .label {{
+        }
+        .stat-card .label {
             color: #666;
             margin-top: 5px;
-        }}
-        .card {{
+        }
+        .card {
             background: white;
             border-radius: 16px;
             padding: 30px;
             margin: 20px 0;
             box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-        .card h2 {{
+        }
+        .card h2 {
             color: #333;
             margin-bottom: 20px;
             font-size: 1.5rem;
-        }}
-        table {{
+        }
+        table {
             width: 100%;
             border-collapse: collapse;
-        }}
-        th, td {{
+        }
+        th, td {
             padding: 15px 10px;
             text-align: left;
             border-bottom: 1px solid #eee;
-        }}
-        th {{
+        }
+        th {
             background: #f8f9fa;
             font-weight: 600;
             color: #555;
-        }}
-        .rank {{ font-size: 1.2rem; width: 60px; }}
-        .model-name {{ color: #333; }}
-        .category-tag {{
+        }
+        .rank { font-size: 1.2rem; width: 60px; }
+        .model-name { color: #333; }
+        .category-tag {
             display: inline-block;
             padding: 4px 12px;
             border-radius: 12px;
             color: white;
             font-size: 0.85rem;
-        }}
-        .downloads {{ color: #667eea; font-weight: 600; }}
-        .likes {{ color: #e91e63; }}
-        .author {{ color: #888; font-size: 0.9rem; }}
-        .image-grid {{
+        }
+        .downloads { color: #667eea; font-weight: 600; }
+        .likes { color: #e91e63; }
+        .author { color: #888; font-size: 0.9rem; }
+        .image-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
             gap: 20px;
             margin: 20px 0;
-        }}
-        .image-card {{
+        }
+        .image-card {
             background: white;
             border-radius: 16px;
             padding: 20px;
             box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-        .image-card h3 {{
+        }
+        .image-card h3 {
             color: #333;
             margin-bottom: 15px;
             font-size: 1.2rem;
-        }}
-        .image-card img {{
+        }
+        .image-card img {
             width: 100%;
             border-radius: 8px;
             cursor: pointer;
             transition: transform 0.3s ease, box-shadow 0.3s ease;
-        }}
-        .image-card img:hover {{
+        }
+        .image-card img:hover {
             transform: scale(1.02);
             box-shadow: 0 5px 20px rgba(0,0,0,0.2);
-        }}
-        .trends {{
+        }
+        .trends {
             background: white;
             border-radius: 16px;
             padding: 30px;
             margin: 20px 0;
             box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-        }}
-        .trends h2 {{
+        }
+        .trends h2 {
             color: #333;
             margin-bottom: 20px;
-        }}
-        .trends ul {{
+        }
+        .trends ul {
             list-style: none;
-        }}
-        .trends li {{
+        }
+        .trends li {
             padding: 12px 0;
             border-bottom: 1px solid #eee;
             color: #555;
             line-height: 1.6;
-        }}
-        .trends li:last-child {{
+        }
+        .trends li:last-child {
             border-bottom: none;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             color: white;
             padding: 30px;
             opacity: 0.9;
-        }}
-        .modal {{
+        }
+        .modal {
             display: none;
             position: fixed;
             z-index: 1000;
@@ -306,8 +396,8 @@ def generate_html(data, output_name="index.html"):
             height: 100%;
             background-color: rgba(0,0,0,0.9);
             cursor: pointer;
-        }}
-        .modal-content {{
+        }
+        .modal-content {
             margin: auto;
             display: block;
             max-width: 90%;
@@ -318,8 +408,8 @@ def generate_html(data, output_name="index.html"):
             transform: translate(-50%, -50%);
             border-radius: 8px;
             box-shadow: 0 0 30px rgba(255,255,255,0.2);
-        }}
-        .modal-close {{
+        }
+        .modal-close {
             position: absolute;
             top: 20px;
             right: 35px;
@@ -328,8 +418,8 @@ def generate_html(data, output_name="index.html"):
             font-weight: bold;
             cursor: pointer;
             z-index: 1001;
-        }}
-        .modal-title {{
+        }
+        .modal-title {
             position: absolute;
             bottom: 20px;
             left: 50%;
@@ -340,23 +430,23 @@ def generate_html(data, output_name="index.html"):
             background: rgba(0,0,0,0.5);
             padding: 10px 20px;
             border-radius: 8px;
-        }}
-        .click-hint {{
+        }
+        .click-hint {
             text-align: center;
             color: #888;
             font-size: 0.85rem;
             margin-top: 8px;
-        }}
-        .tag-cloud {{
+        }
+        .tag-cloud {
             text-align: center;
             padding: 20px;
             background: #f8f9fa;
             border-radius: 15px;
             margin-top: 15px;
-        }}
+        }
         
         /* ========== 新增: 精美技术关键字词云样式 ========== */
-        .keyword-cloud-container {{
+        .keyword-cloud-container {
             position: relative;
             background: 
                 radial-gradient(ellipse at 20% 30%, rgba(99, 102, 241, 0.08) 0%, transparent 50%),
@@ -373,8 +463,8 @@ def generate_html(data, output_name="index.html"):
             gap: 8px 12px;
             border: 1px solid rgba(102, 126, 234, 0.15);
             box-shadow: inset 0 2px 15px rgba(102, 126, 234, 0.05);
-        }}
-        .keyword-cloud-container a {{
+        }
+        .keyword-cloud-container a {
             text-decoration: none;
             font-weight: 600;
             transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1);
@@ -382,79 +472,79 @@ def generate_html(data, output_name="index.html"):
             border-radius: 10px;
             display: inline-block;
             letter-spacing: 0.5px;
-        }}
-        .keyword-cloud-container a:hover {{
+        }
+        .keyword-cloud-container a:hover {
             transform: scale(1.12) translateY(-3px);
             box-shadow: 0 8px 25px rgba(0,0,0,0.15);
-        }}
+        }
         /* 超热门 */
-        .kw-hot {{
+        .kw-hot {
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white !important;
             font-size: 1.6rem;
             padding: 10px 18px;
             border-radius: 14px;
             box-shadow: 0 4px 15px rgba(102, 126, 234, 0.4);
-        }}
-        .kw-hot:hover {{
+        }
+        .kw-hot:hover {
             box-shadow: 0 10px 35px rgba(102, 126, 234, 0.5) !important;
-        }}
+        }
         /* 热门 */
-        .kw-warm {{
+        .kw-warm {
             background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%);
             color: white !important;
             font-size: 1.35rem;
             padding: 8px 15px;
             box-shadow: 0 3px 12px rgba(245, 87, 108, 0.3);
-        }}
+        }
         /* 上升中 */
-        .kw-medium {{
+        .kw-medium {
             background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%);
             color: white !important;
             font-size: 1.15rem;
             box-shadow: 0 3px 10px rgba(79, 172, 254, 0.3);
-        }}
+        }
         /* 一般 */
-        .kw-normal {{
+        .kw-normal {
             background: rgba(102, 126, 234, 0.1);
             color: #667eea !important;
             font-size: 1rem;
-        }}
-        .kw-normal:hover {{
+        }
+        .kw-normal:hover {
             background: rgba(102, 126, 234, 0.2);
-        }}
+        }
         
-        .keyword-legend {{
+        .keyword-legend {
             display: flex;
             justify-content: center;
             gap: 20px;
             margin-top: 15px;
             flex-wrap: wrap;
-        }}
-        .keyword-legend-item {{
+        }
+        .keyword-legend-item {
             display: flex;
             align-items: center;
             gap: 6px;
             font-size: 0.8rem;
             color: #666;
-        }}
-        .keyword-legend-dot {{
+        }
+        .keyword-legend-dot {
             width: 12px;
             height: 12px;
             border-radius: 4px;
-        }}
-        .keyword-legend-dot.hot {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }}
-        .keyword-legend-dot.warm {{ background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); }}
-        .keyword-legend-dot.medium {{ background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); }}
-        .keyword-legend-dot.normal {{ background: rgba(102, 126, 234, 0.3); }}
+        }
+        .keyword-legend-dot.hot { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); }
+        .keyword-legend-dot.warm { background: linear-gradient(135deg, #f093fb 0%, #f5576c 100%); }
+        .keyword-legend-dot.medium { background: linear-gradient(135deg, #4facfe 0%, #00f2fe 100%); }
+        .keyword-legend-dot.normal { background: rgba(102, 126, 234, 0.3); }
         
-        .keyword-hint {{
+        .keyword-hint {
             text-align: center;
             margin-top: 12px;
             padding-top: 12px;
             border-top: 1px dashed rgba(102, 126, 234, 0.2);
-        }}
-        .keyword-hint .badge {{
+        }
+        .keyword-hint .badge {
             display: inline-block;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
@@ -463,24 +553,39 @@ def generate_html(data, output_name="index.html"):
             font-size: 0.75rem;
             font-weight: 600;
             margin-right: 8px;
-        }}
-        .keyword-hint .text {{
+        }
+        .keyword-hint .text {
             color: #888;
             font-size: 0.85rem;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .header h1 {{ font-size: 1.8rem; }}
-            .image-grid {{ grid-template-columns: 1fr; }}
-            th, td {{ padding: 10px 5px; font-size: 0.9rem; }}
-            .kw-hot {{ font-size: 1.3rem; padding: 8px 14px; }}
-            .kw-warm {{ font-size: 1.15rem; }}
-            .kw-medium {{ font-size: 1rem; }}
-            .kw-normal {{ font-size: 0.9rem; }}
-        }}
-    </style>
+        @media (max-width: 768px) {
+            .header h1 { font-size: 1.8rem; }
+            .image-grid { grid-template-columns: 1fr; }
+            th, td { padding: 10px 5px; font-size: 0.9rem; }
+            .kw-hot { font-size: 1.3rem; padding: 8px 14px; }
+            .kw-warm { font-size: 1.15rem; }
+            .kw-medium { font-size: 1rem; }
+            .kw-normal { font-size: 0.9rem; }
+        }
+"""
+_CSS_MIN = _minify_css(_CSS)
+
+# 页面模板 (模块级常量，仅在导入时构建一次)
+# <head> 部分是纯静态内容，导入时直接编码为字节
+_HTML_HEAD_BYTES = ("""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>HF 热榜日报 - Hugging Face 热门 AI 技术分析</title>
+    <style>
+""" + _CSS_MIN + """</style>
 </head>
-<body>
+""").encode('utf-8')
+
+# <body> 以表格行为界拆成上下两段 (花括号需写成 {{ }})
+_HTML_BODY_TOP = """<body>
     <div class="container">
         <div class="header">
             <h1>🔥 HF 热榜日报</h1>
@@ -492,7 +597,7 @@ def generate_html(data, output_name="index.html"):
         
         <div class="stats-grid">
             <div class="stat-card">
-                <div class="number">{len(trending)}</div>
+                <div class="number">{trending_count}</div>
                 <div class="label">热门模型</div>
             </div>
             <div class="stat-card">
@@ -523,7 +628,9 @@ def generate_html(data, output_name="index.html"):
                     </tr>
                 </thead>
                 <tbody>
-                    {table_rows}
+                    """
+
+_HTML_BODY_BOTTOM = """
                 </tbody>
             </table>
         </div>
@@ -606,7 +713,10 @@ def generate_html(data, output_name="index.html"):
             <div style="margin-top: 15px;">
                 <ul style="list-style: none; padding: 0;">
                     {archive_links}
-                </ul>
+"""
+
+# 页面尾部 (页脚、图片弹窗与脚本) 不含占位符，导入时直接编码为字节
+_HTML_TAIL_BYTES = """                </ul>
             </div>
         </div>
         
@@ -623,44 +733,122 @@ def generate_html(data, output_name="index.html"):
     </div>
     
     <script>
-        document.querySelectorAll('.zoomable').forEach(function(img) {{
-            img.addEventListener('click', function() {{
+        document.querySelectorAll('.zoomable').forEach(function(img) {
+            img.addEventListener('click', function() {
                 var modal = document.getElementById('imageModal');
                 var modalImg = document.getElementById('modalImage');
                 var modalTitle = document.getElementById('modalTitle');
                 modal.style.display = 'block';
                 modalImg.src = this.src;
                 modalTitle.textContent = this.getAttribute('data-title') || this.alt;
-            }});
-        }});
-        function closeModal() {{
+            });
+        });
+        function closeModal() {
             document.getElementById('imageModal').style.display = 'none';
-        }}
-        document.addEventListener('keydown', function(e) {{
-            if (e.key === 'Escape') {{
+        }
+        document.addEventListener('keydown', function(e) {
+            if (e.key === 'Escape') {
                 closeModal();
-            }}
-        }});
+            }
+        });
     </script>
 </body>
 </html>
-"""
-    output_path = os.path.join(ROOT_DIR, output_name)
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html)
+""".encode('utf-8')
+
+def _iter_html(ctx, table_rows):
+    """逐段产出编码后的页面内容，避免拼出整页字符串"""
+    yield _HTML_HEAD_BYTES
+    yield _HTML_BODY_TOP.format_map(ctx).encode('utf-8')
+    for row in table_rows:
+        yield row.encode('utf-8')
+    yield _HTML_BODY_BOTTOM.format_map(ctx).encode('utf-8')
+    yield _HTML_TAIL_BYTES
+
+def generate_html(data, output_name="index.html", cache_key=None, hf_files=None, gzip_output=False):
+    output_path = _output_path(output_name)
+    # 数据文件未变化且页面已存在时，直接复用上次生成的页面
+    if is_up_to_date(output_path, cache_key, gzip_output):
+        print(f"数据未变化，复用已有页面: {output_name}")
+        return output_path
+    
+    date = data.get("date", datetime.now().strftime("%Y-%m-%d"))
+    trending = data.get("trending_models", [])[:10]
+    stats = data.get("statistics") or {}
+    tech_dist = stats.get("tech_distribution") or {}
+    tech_keywords = stats.get("tech_keywords") or {}  # 新增
+    
+    total_models = sum(len(data.get(k, ())) for k in ("trending_models", "most_downloaded", "most_liked"))
+    tech_count = len(tech_dist)
+    tech_total = sum(tech_dist.values())
+    llm_ratio = tech_dist.get("语言模型", 0) / tech_total * 100 if tech_total > 0 else 0
+    
+    files = hf_files if hf_files is not None else _list_hf_data_files()
+    archive_links = _render_archive_links(_recent_data_files(files))
+    
+    # 生成交互式标签云 (技术领域分类)
+    tag_cloud_items = []
+    if tech_dist:
+        max_count = max(tech_dist.values())
+        for tech, count in sorted(tech_dist.items(), key=lambda x: x[1], reverse=True):
+            url = _CAT_INFO.get(tech, _DEFAULT_CAT_INFO)[0]
+            font_size = 0.8 + (count / max_count) * 1.0
+            tag_cloud_items.append(_TAG_LINK_TEMPLATE.format(url=url, font_size=font_size, tech=escape(tech)))
+    tag_cloud_html = "".join(tag_cloud_items)
+
+    # ========== 新增: 生成精美技术关键字词云 ==========
+    keyword_cloud_html = generate_keyword_cloud_html(tech_keywords)
+
+    table_rows = (_render_row(i, model) for i, model in enumerate(trending, 1))
+    
+    ctx = {
+        "date": date,
+        "trending_count": len(trending),
+        "tech_count": tech_count,
+        "total_models": total_models,
+        "llm_ratio": llm_ratio,
+        "keyword_cloud_html": keyword_cloud_html,
+        "tag_cloud_html": tag_cloud_html,
+        "archive_links": archive_links,
+    }
+    if gzip_output:
+        # 同时输出预压缩的 .gz 版本 (mtime=0 保证内容不变时字节一致)
+        html_bytes = b"".join(_iter_html(ctx, table_rows))
+        _atomic_write(output_path, [html_bytes])
+        _atomic_write(output_path + ".gz", [gzip.compress(html_bytes, compresslevel=9, mtime=0)])
+    else:
+        _atomic_write(output_path, _iter_html(ctx, table_rows))
+        # 删除旧的 .gz，避免内容协商时提供过期页面
+        try:
+            os.remove(output_path + ".gz")
+        except FileNotFoundError:
+            pass
+    if cache_key:
+        _write_cache_key(output_path, cache_key)
     return output_path
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument('--date', help='日期格式: YYYY-MM-DD')
     parser.add_argument('--output', help='输出文件名')
+    parser.add_argument('--gzip', action='store_true', help='同时生成 gzip 预压缩文件 (.html.gz)')
     args = parser.parse_args()
     
     output_name = args.output if args.output else 'index.html'
-    data = load_data(args.date if args.date else None)
+    hf_files = _list_hf_data_files()
+    source_path = resolve_data_path(args.date if args.date else None, hf_files)
+    raw = _read_bytes(source_path) if source_path else None
+    cache_key = source_cache_key(raw, _recent_data_files(hf_files), args.gzip) if raw is not None else None
+    
+    # 在解析 JSON 之前检查缓存，数据未变化时整个渲染流程都可以跳过
+    if is_up_to_date(_output_path(output_name), cache_key, args.gzip):
+        print(f"数据未变化，复用已有页面: {output_name}")
+        sys.exit(0)
+    
+    data = _parse_json(raw) if raw is not None else None
     
     if data:
-        generate_html(data, output_name)
+        generate_html(data, output_name, cache_key=cache_key, hf_files=hf_files, gzip_output=args.gzip)
         print(f"✅ HTML 报告已生成: {output_name}")
     else:
         print("❌ 错误: 无法加载数据文件")
@@ -4,18 +4,54 @@ Hugging Face 热门 AI 技术爬取脚本 (GitHub Actions 版本)
 更新: 增加技术关键字标签提取功能，用于生成精美交互式词云
 """
 
+import hashlib
 import json
 import os
-import re
 import requests
+from bisect import bisect_right
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from huggingface_hub import HfApi
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from collections import Counter
+from itertools import chain
+
+try:
+    import orjson  # 可选: 更快的 JSON 序列化
+except ImportError:
+    orjson = None
+
+try:
+    from huggingface_hub import configure_http_backend  # huggingface_hub < 1.0 (基于 requests)
+except ImportError:
+    configure_http_backend = None  # 新版本基于 httpx，内部已复用全局连接池
 
 # 配置 - 使用当前工作目录
 ROOT_DIR = os.getcwd()
 DATA_DIR = ROOT_DIR  # 直接保存到根目录
+CACHE_DIR = os.path.join(ROOT_DIR, ".cache", "hf")  # HF 接口响应缓存 (按 ETag 校验)
+
+# 全局共享的 HfApi 实例，各次请求 (包括并发线程) 复用同一个连接池
+_HF_API = HfApi()
+
+def _make_session() -> requests.Session:
+    """HTTP 会话: 保持长连接，遇到限流/服务端错误自动重试"""
+    session = requests.Session()
+    session.headers["User-Agent"] = "hf-tech-daily/1.0"
+    session.mount("https://", HTTPAdapter(
+        pool_connections=4, pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+    ))
+    return session
+
+# 直接请求 HF 接口 (_cached_get) 时共用的会话
+_SESSION = _make_session()
+# 旧版 huggingface_hub 按线程调用 backend_factory，每个线程各自持有一个会话 (requests.Session 不保证线程安全)
+if configure_http_backend:
+    configure_http_backend(backend_factory=_make_session)
 
 # 技术领域分类映射
 TECH_CATEGORIES = {
@@ -31,6 +67,9 @@ TECH_CATEGORIES = {
     "其他": []
 }
 
+# pipeline_tag -> 技术领域 的反向索引，分类时一次哈希查找即可
+_TAG_TO_CAT = {tag: category for category, tags in TECH_CATEGORIES.items() for tag in tags}
+
 # ========== 新增: 技术关键字提取配置 ==========
 # 已知的热门技术关键字 (用于从模型ID和标签中匹配)
 KNOWN_TECH_KEYWORDS = [
@@ -61,31 +100,28 @@ KNOWN_TECH_KEYWORDS = [
     "Alibaba", "Tencent", "Baidu", "ByteDance", "01-ai", "Colossal",
 ]
 
+# (原始写法, 小写形式)，匹配时只需对小写字符串做子串判断
+_KEYWORDS_LOWER = [(keyword, keyword.lower()) for keyword in KNOWN_TECH_KEYWORDS]
+
+# 参数规模分档: 阈值 (升序) 与对应标签，标签比阈值多一个
+_SIZE_THRESHOLDS = (1e9, 7e9, 32e9, 128e9)
+_SIZE_LABELS = ("微型 (<1B)", "小型 (1B-7B)", "中型 (7B-32B)", "大型 (32B-128B)", "超大型 (>128B)")
+
+@lru_cache(maxsize=256)
 def get_size_category(num_params: Optional[int]) -> str:
     if num_params is None:
         return "未知"
-    if num_params < 1e9:
-        return "微型 (<1B)"
-    elif num_params < 7e9:
-        return "小型 (1B-7B)"
-    elif num_params < 32e9:
-        return "中型 (7B-32B)"
-    elif num_params < 128e9:
-        return "大型 (32B-128B)"
-    else:
-        return "超大型 (>128B)"
+    return _SIZE_LABELS[bisect_right(_SIZE_THRESHOLDS, num_params)]
 
+@lru_cache(maxsize=256)
 def get_tech_category(pipeline_tag: Optional[str]) -> str:
     if pipeline_tag is None:
         return "其他"
-    for category, tags in TECH_CATEGORIES.items():
-        if pipeline_tag in tags:
-            return category
-    return "其他"
+    return _TAG_TO_CAT.get(pipeline_tag, "其他")
 
 # ========== 新增: 从模型ID和标签中提取技术关键字 ==========
 # 需要排除的非技术标签 (pipeline tags, 框架, 部署等)
-EXCLUDE_TAGS = [
+EXCLUDE_TAGS = frozenset([
     # Pipeline tags
     "text-generation", "text2text-generation", "conversational", "text-to-image",
     "image-to-text", "text-to-speech", "automatic-speech-recognition", "text-to-audio",
@@ -107,38 +143,61 @@ EXCLUDE_TAGS = [
     # 其他无意义标签
     "arxiv", "autotrain", "autotrain_compatible", "eval", "generated_from_trainer",
     "base_model", "finetune", "adapter", "merge", "quantized", "4bit", "8bit",
-]
+])
 
 def extract_tech_keywords(model_id: str, tags: List[str]) -> List[str]:
     """从模型ID和标签中提取技术关键字"""
-    keywords = set()
-    
     # 从模型ID中提取
     model_name = model_id.split("/")[-1] if "/" in model_id else model_id
     
-    for keyword in KNOWN_TECH_KEYWORDS:
-        # 不区分大小写匹配
-        pattern = re.compile(re.escape(keyword), re.IGNORECASE)
-        if pattern.search(model_name):
-            # 保留原始大小写形式
-            keywords.add(keyword)
+    # 模型名与非排除标签拼成一个小写字符串 (换行分隔，关键字不含换行，不会跨段误匹配)，
+    # 每个关键字只需做一次不区分大小写的子串判断；结果保留原始大小写形式，按关键字表顺序排列
+    tags_lower = (tag.lower() for tag in tags)
+    haystack = "\n".join([model_name.lower(), *(tag for tag in tags_lower if tag not in EXCLUDE_TAGS)])
+    return [keyword for keyword, keyword_lower in _KEYWORDS_LOWER if keyword_lower in haystack]
+
+# 缓存的校验头 -> 下次请求时对应的条件请求头
+_VALIDATOR_HEADERS = {"ETag": "If-None-Match", "Last-Modified": "If-Modified-Since"}
+
+def _cached_get(url: str) -> bytes:
+    """带条件请求的 GET (ETag / Last-Modified): 服务端返回 304 时直接复用本地缓存的响应体"""
+    cache_key = hashlib.sha1(url.encode('utf-8')).hexdigest()
+    body_path = os.path.join(CACHE_DIR, cache_key + ".json")
+    meta_path = os.path.join(CACHE_DIR, cache_key + ".meta")
+    
+    headers = {}
+    if os.path.exists(body_path):
+        try:
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                validators = json.load(f)
+            headers = {_VALIDATOR_HEADERS[k]: v for k, v in validators.items() if k in _VALIDATOR_HEADERS}
+        except (OSError, ValueError):
+            pass
     
-    # 从标签中匹配已知技术关键字
-    for tag in tags:
-        tag_lower = tag.lower()
-        for keyword in KNOWN_TECH_KEYWORDS:
-            if keyword.lower() == tag_lower or keyword.lower() in tag_lower:
-                keywords.add(keyword)
+    response = _SESSION.get(url, headers=headers, timeout=(5, 30))
+    if response.status_code == 304:
+        print("  数据未变化 (304)，使用本地缓存")
+        with open(body_path, 'rb') as f:
+            return f.read()
+    response.raise_for_status()
     
-    return list(keywords)
+    body = response.content
+    validators = {k: response.headers[k] for k in _VALIDATOR_HEADERS if k in response.headers}
+    if validators:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(body_path, 'wb') as f:
+            f.write(body)
+        with open(meta_path, 'w', encoding='utf-8') as f:
+            json.dump(validators, f)
+    return body
 
 def fetch_trending_models(limit: int = 100) -> List[Dict]:
     print(f"正在获取热门模型 (Top {limit})...")
     url = "https://huggingface.co/api/trending"
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        data = response.json()
+        # 直接解析响应体字节，省去先解码成 str 的一步
+        body = _cached_get(url)
+        data = orjson.loads(body) if orjson else json.loads(body)
         
         models = []
         for item in data.get("recentlyTrending", [])[:limit]:
@@ -155,7 +214,6 @@ def fetch_trending_models(limit: int = 100) -> List[Dict]:
                     "num_parameters": repo_data.get("numParameters"),
                     "last_modified": repo_data.get("lastModified"),
                     "tags": tags if isinstance(tags, list) else [],
-                    "tech_keywords": extract_tech_keywords(model_id, tags if isinstance(tags, list) else []),
                     "source": "trending"
                 })
         print(f"  获取到 {len(models)} 个热门模型")
@@ -164,11 +222,19 @@ def fetch_trending_models(limit: int = 100) -> List[Dict]:
         print(f"  获取热门模型失败: {e}")
         return []
 
+# list_models 额外请求 enrich_model_data 用到的字段 (lastModified、safetensors 不在默认返回字段中)
+_LIST_MODELS_EXPAND = ["author", "downloads", "likes", "pipeline_tag", "tags", "lastModified", "safetensors"]
+
+def _num_parameters(model) -> Optional[int]:
+    """读取模型参数总量: safetensors 信息缺失或为空时返回 None"""
+    safetensors = getattr(model, "safetensors", None)
+    return safetensors.get("total") if safetensors else None
+
 def fetch_models_by_sort(sort: str, limit: int = 100, pipeline_tag: Optional[str] = None) -> List[Dict]:
     print(f"正在获取模型 (sort={sort}, limit={limit})...")
-    api = HfApi()
+    api = _HF_API
     try:
-        models_iter = api.list_models(sort=sort, limit=limit, pipeline_tag=pipeline_tag)
+        models_iter = api.list_models(sort=sort, limit=limit, pipeline_tag=pipeline_tag, expand=_LIST_MODELS_EXPAND)
         
         models = []
         for model in models_iter:
@@ -182,10 +248,9 @@ def fetch_models_by_sort(sort: str, limit: int = 100, pipeline_tag: Optional[str
                 "pipeline_tag": model.pipeline_tag,
                 "downloads": getattr(model, 'downloads', 0),
                 "likes": getattr(model, 'likes', 0),
-                "num_parameters": getattr(model, 'safetensors', {}).get('total') if hasattr(model, 'safetensors') and model.safetensors else None,
+                "num_parameters": _num_parameters(model),
                 "last_modified": model.last_modified.isoformat() if model.last_modified else None,
                 "tags": tags,
-                "tech_keywords": extract_tech_keywords(model_id, tags),
                 "source": f"{sort}"
             })
         print(f"  获取到 {len(models)} 个模型")
@@ -198,13 +263,16 @@ def fetch_models_by_category(limit_per_category: int = 20) -> Dict[str, List[Dic
     print("正在按技术领域获取模型...")
     category_models = {}
     
-    for category, tags in TECH_CATEGORIES.items():
-        if not tags:
-            continue
-        category_models[category] = []
-        for tag in tags[:2]:
-            models = fetch_models_by_sort("downloads", limit=limit_per_category, pipeline_tag=tag)
-            category_models[category].extend(models)
+    # 每个领域取前两个 pipeline_tag，各标签的请求互不依赖，并发获取 (map 保持提交顺序)
+    jobs = [(category, tag) for category, tags in TECH_CATEGORIES.items() if tags for tag in tags[:2]]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = executor.map(
+            lambda job: fetch_models_by_sort("downloads", limit=limit_per_category, pipeline_tag=job[1]), jobs
+        )
+        for (category, _), models in zip(jobs, results):
+            category_models.setdefault(category, []).extend(models)
+    
+    for category in category_models:
         seen_ids = set()
         unique_models = []
         for m in category_models[category]:
@@ -216,13 +284,15 @@ def fetch_models_by_category(limit_per_category: int = 20) -> Dict[str, List[Dic
     return category_models
 
 def enrich_model_data(models: List[Dict]) -> List[Dict]:
+    # 关键字提取也放在这里统一处理，抓取函数只负责整理接口字段
     for model in models:
+        model["tech_keywords"] = extract_tech_keywords(model["id"], model["tags"])
         model["tech_category"] = get_tech_category(model.get("pipeline_tag"))
         model["size_category"] = get_size_category(model.get("num_parameters"))
     return models
 
 # ========== 新增: 统计技术关键字热度 ==========
-def calculate_keyword_stats(all_models: List[Dict]) -> Dict[str, int]:
+def calculate_keyword_stats(all_models: Iterable[Dict]) -> Dict[str, int]:
     """统计所有模型中技术关键字的出现频率"""
     keyword_counter = Counter()
     
@@ -256,58 +326,78 @@ def collect_all_data() -> Dict:
         "statistics": {}
     }
     
-    data["trending_models"] = enrich_model_data(fetch_trending_models(100))
-    data["most_downloaded"] = enrich_model_data(fetch_models_by_sort("downloads", 100))
-    data["most_liked"] = enrich_model_data(fetch_models_by_sort("likes", 100))
+    # 三个榜单与分领域列表互不依赖，耗时主要在网络等待上，并发请求
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        trending_future = executor.submit(fetch_trending_models, 100)
+        downloaded_future = executor.submit(fetch_models_by_sort, "downloads", 100)
+        liked_future = executor.submit(fetch_models_by_sort, "likes", 100)
+        category_future = executor.submit(fetch_models_by_category, 20)
+    data["trending_models"] = enrich_model_data(trending_future.result())
+    data["most_downloaded"] = enrich_model_data(downloaded_future.result())
+    data["most_liked"] = enrich_model_data(liked_future.result())
     
-    category_models = fetch_models_by_category(20)
-    for category, models in category_models.items():
+    for category, models in category_future.result().items():
         data["by_category"][category] = enrich_model_data(models)
     
-    all_models = data["trending_models"] + data["most_downloaded"] + data["most_liked"]
-    
-    tech_dist = {}
-    for model in all_models:
-        cat = model.get("tech_category", "其他")
-        tech_dist[cat] = tech_dist.get(cat, 0) + 1
-    data["statistics"]["tech_distribution"] = tech_dist
+    # 三个榜单按顺序串联遍历，不再拼接出一个新的大列表 (同一模型出现在多个榜单时按出现次数计)
+    model_lists = (data["trending_models"], data["most_downloaded"], data["most_liked"])
     
-    org_dist = {}
-    for model in all_models:
+    # 技术领域、机构与参数规模分布在同一次遍历中统计
+    tech_dist = Counter()
+    org_dist = Counter()
+    size_dist = Counter()
+    for model in chain.from_iterable(model_lists):
+        tech_dist[model.get("tech_category", "其他")] += 1
         author = model.get("author")
         if author:
-            org_dist[author] = org_dist.get(author, 0) + 1
-    data["statistics"]["top_organizations"] = dict(
-        sorted(org_dist.items(), key=lambda x: x[1], reverse=True)[:20]
-    )
-    
-    size_dist = {}
-    for model in all_models:
-        size = model.get("size_category", "未知")
-        size_dist[size] = size_dist.get(size, 0) + 1
-    data["statistics"]["size_distribution"] = size_dist
+            org_dist[author] += 1
+        size_dist[model.get("size_category", "未知")] += 1
+    data["statistics"]["tech_distribution"] = dict(tech_dist)
+    data["statistics"]["top_organizations"] = dict(org_dist.most_common(20))
+    data["statistics"]["size_distribution"] = dict(size_dist)
     
     # ========== 新增: 技术关键字热度统计 ==========
     print("正在统计技术关键字热度...")
-    keyword_stats = calculate_keyword_stats(all_models)
+    keyword_stats = calculate_keyword_stats(chain.from_iterable(model_lists))
     data["statistics"]["tech_keywords"] = keyword_stats
     print(f"  提取到 {len(keyword_stats)} 个热门技术关键字")
     
     print(f"\n数据采集完成!")
     return data
 
+def _dump_json(data: Dict) -> bytes:
+    """序列化为缩进 2 格、保留中文的 UTF-8 字节"""
+    if orjson:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+
+def _atomic_write(path: str, content: bytes) -> None:
+    # 先写临时文件再替换，读取方不会看到写了一半的 JSON
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
 def save_data(data: Dict) -> str:
     # 保存到根目录
     filename = f"hf_data_{data['date']}.json"
     filepath = os.path.join(ROOT_DIR, filename)
     
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # 只序列化、写盘一次
+    content = _dump_json(data)
+    _atomic_write(filepath, content)
     
-    # 同时保存为 latest.json
+    # 同时保存为 latest.json: 硬链接到当天文件 (先链接到临时名再替换，保持原子性)，
+    # 文件系统不支持硬链接时退回为再写一份
     latest_path = os.path.join(ROOT_DIR, "latest.json")
-    with open(latest_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    tmp_path = latest_path + ".tmp"
+    try:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        os.link(filepath, tmp_path)
+        os.replace(tmp_path, latest_path)
+    except OSError:
+        _atomic_write(latest_path, content)
     
     print(f"数据已保存到: {filepath}")
     print(f"latest.json 已保存到: {latest_path}")
@@ -1,11 +1,25 @@
+import hashlib
+import heapq
 import json
 import os
+import matplotlib
+matplotlib.use('Agg')  # 只輸出 PNG，不需要互動式後端
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import font_manager
+from matplotlib.ticker import FuncFormatter
 import pandas as pd
-import glob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont
 from wordcloud import WordCloud
 from datetime import datetime
 
+try:
+    import orjson  # 可選: 更快的 JSON 解析
+except ImportError:
+    orjson = None
+
 
 # 僅用於趨勢圖顯示的映射，解決 GitHub Actions 環境下的中文亂碼問題
 DISPLAY_LABELS = {
@@ -34,79 +48,160 @@ CATEGORY_COLORS = {
     "Computer Vision": "#BB8FCE",
     "Others": "#85C1E9"
 }
+_FALLBACK_COLOR = CATEGORY_COLORS["Others"]
+
+# 'fast' 樣式：路徑簡化門檻取最大並分塊繪製，減少 Agg 的逐段處理
+plt.style.use('fast')
+
+# PNG 預設 zlib level 6 壓縮佔了存檔大部分時間，level 3 編碼快得多、檔案只略大
+_PNG_PIL_KWARGS = {'compress_level': 3}
+
+# 詞雲排版 (碰撞檢測) 很耗時，相同輸入時直接重用上次的 layout_
+WORDCLOUD_CACHE_DIR = os.path.join('.cache', 'wordcloud')
+_WORDCLOUD_PARAMS = dict(width=1200, height=600, background_color='white',
+                         colormap='viridis', max_words=100)
+_WORDCLOUD_CANVAS_SIZE = (1500, 750)
+_WORDCLOUD_TITLE_HEIGHT = 60
+
+
+def load_json(path):
+    # 以位元組讀入直接解析，省去解碼成 str 的一步
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson else json.loads(raw)
+
+
+def generate_top_models_chart(top_models, date_str):
+    # --- 1. 保留原始：Top Models Leaderboard ---
+    # 單次遍歷拆成三個平行序列 (已反轉，讓第一名在最上方)
+    names, downloads, likes = zip(*[
+        (m['id'].split('/')[-1], m.get('downloads', 0), m.get('likes', 0))
+        for m in reversed(top_models)
+    ])
+    
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+    ax1.barh(names, downloads, color='skyblue')
+    ax1.set_title('Top Models by Downloads')
+    ax2.barh(names, likes, color='lightcoral')
+    ax2.set_title('Top Models by Likes')
+    plt.tight_layout()
+    plt.savefig(f'top_models_{date_str}.png', pil_kwargs=_PNG_PIL_KWARGS)
+    plt.close()
+
+
+def generate_tech_dist_chart(dist, date_str):
+    # --- 2. 保留原始：Tech Distribution (Pie & Bar) ---
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
+    ax1.pie(dist.values(), labels=dist.keys(), autopct='%1.1f%%', colors=plt.cm.Paired.colors)
+    ax1.set_title('Tech Distribution (Pie)')
+    ax2.bar(dist.keys(), dist.values(), color=plt.cm.Set3.colors)
+    ax2.set_title('Tech Distribution (Bar)')
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
+    plt.savefig(f'tech_dist_{date_str}.png', pil_kwargs=_PNG_PIL_KWARGS)
+    plt.close()
+
+
+def generate_org_chart(orgs, date_str):
+    # --- 4. 保留原始：Active Organizations Ranking ---
+    df_org = pd.DataFrame(list(orgs.items()), columns=['Organization', 'Count']).sort_values('Count', ascending=True)
+    plt.figure(figsize=(10, 8))
+    plt.barh(df_org['Organization'], df_org['Count'], color='teal')
+    plt.title(f'Active Organizations - {date_str}')
+    plt.tight_layout()
+    plt.savefig(f'org_ranking_{date_str}.png', pil_kwargs=_PNG_PIL_KWARGS)
+    plt.close()
+
+
+def build_wordcloud(text):
+    key = hashlib.sha1(json.dumps([text, _WORDCLOUD_PARAMS], sort_keys=True).encode('utf-8')).hexdigest()
+    cache_path = os.path.join(WORDCLOUD_CACHE_DIR, f'{key}.json')
+    wordcloud = WordCloud(**_WORDCLOUD_PARAMS)
+    try:
+        # layout_ 只含字串、數字與 None，以 JSON 儲存 (不用 pickle，快取來自共享的 actions cache)
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            wordcloud.layout_ = [
+                ((word, freq), font_size, (x, y), orientation, color)
+                for (word, freq), font_size, (x, y), orientation, color in json.load(f)
+            ]
+        return wordcloud
+    except (OSError, ValueError, KeyError, TypeError):
+        # 快取不存在或內容無效時，重新排版
+        pass
+    
+    # wordcloud 排版時每個詞、每次縮小字號都重新開啟一次 TTF；僅在排版期間讓同一 (字型, 字號)
+    # 共用同一個字型物件 (字型物件不會被修改，TransposedFont 只是包裝)，詞雲生成約快四成
+    truetype = ImageFont.truetype
+    ImageFont.truetype = lru_cache(maxsize=1024)(truetype)
+    try:
+        wordcloud.generate(text)
+    finally:
+        ImageFont.truetype = truetype
+    try:
+        os.makedirs(WORDCLOUD_CACHE_DIR, exist_ok=True)
+        with open(cache_path, 'w', encoding='utf-8') as f:
+            # 座標是 numpy 整數，轉成 int 才能序列化
+            json.dump(wordcloud.layout_, f, default=int)
+        # 關鍵字每天都會變，只保留最新一份 (連同舊版的 .pkl)，避免快取目錄無限增長
+        with os.scandir(WORDCLOUD_CACHE_DIR) as it:
+            stale = [entry.path for entry in it
+                     if entry.name.endswith(('.json', '.pkl')) and entry.path != cache_path]
+        for path in stale:
+            os.remove(path)
+    except OSError as e:
+        print(f"Error writing wordcloud cache: {e}")
+    return wordcloud
+
+
+def generate_wordcloud(text, date_str):
+    # --- 5. 新增：生成詞雲 (Word Cloud) ---
+    # 詞雲本身已是點陣圖，直接用 PIL 加上標題列後存檔，省去 matplotlib 的整輪繪製與縮放
+    # 維持原本 15x7.5 吋 @100dpi (1500x750) 的畫布與 20pt (約 28px) 標題，與歷史圖片可對照
+    # 詞雲按原比例 (2:1) 縮放到標題列下方的高度並水平置中，與 imshow 一樣左右留白、不拉伸
+    width, height = _WORDCLOUD_CANVAS_SIZE
+    cloud_height = height - _WORDCLOUD_TITLE_HEIGHT
+    cloud_width = 2 * cloud_height
+    cloud = build_wordcloud(text).to_image().resize((cloud_width, cloud_height), Image.BILINEAR)
+    img = Image.new('RGB', (width, height), 'white')
+    img.paste(cloud, ((width - cloud_width) // 2, _WORDCLOUD_TITLE_HEIGHT))
+    font = ImageFont.truetype(font_manager.findfont('DejaVu Sans'), 28)
+    ImageDraw.Draw(img).text((width / 2, _WORDCLOUD_TITLE_HEIGHT / 2),
+                             f'Hugging Face Tech Keywords - {date_str}',
+                             fill='black', font=font, anchor='mm')
+    img.save(f'wordcloud_{date_str}.png', **_PNG_PIL_KWARGS)
 
 
 def generate_charts(data_file):
-    with open(data_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    data = load_json(data_file)
     
     date_str = data['date']
     stats = data['statistics']
     all_models = data.get('trending_models', [])
     
-    # --- 1. 保留原始：Top Models Leaderboard ---
+    # 各圖表互不依賴 (各自寫入不同的 PNG)，渲染與 PNG 壓縮都是 CPU 密集，分到多個進程並行
+    jobs = []
     top_models = all_models[:10]
     if top_models:
-        names = [m['id'].split('/')[-1] for m in top_models]
-        downloads = [m.get('downloads', 0) for m in top_models]
-        likes = [m.get('likes', 0) for m in top_models]
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
-        ax1.barh(names[::-1], downloads[::-1], color='skyblue')
-        ax1.set_title('Top Models by Downloads')
-        ax2.barh(names[::-1], likes[::-1], color='lightcoral')
-        ax2.set_title('Top Models by Likes')
-        plt.tight_layout()
-        plt.savefig(f'top_models_{date_str}.png')
-        plt.close()
-
-
-    # --- 2. 保留原始：Tech Distribution (Pie & Bar) ---
+        jobs.append((generate_top_models_chart, (top_models, date_str)))
     dist = stats.get('tech_distribution', {})
     if dist:
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 7))
-        ax1.pie(dist.values(), labels=dist.keys(), autopct='%1.1f%%', colors=plt.cm.Paired.colors)
-        ax1.set_title('Tech Distribution (Pie)')
-        ax2.bar(dist.keys(), dist.values(), color=plt.cm.Set3.colors)
-        ax2.set_title('Tech Distribution (Bar)')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.savefig(f'tech_dist_{date_str}.png')
-        plt.close()
-
-
-    # --- 3. 【修改】模型新鮮度 vs 熱度圖表 (替換原氣泡圖) ---
+        jobs.append((generate_tech_dist_chart, (dist, date_str)))
+    # 【修改】模型新鮮度 vs 熱度圖表 (替換原氣泡圖)
     if all_models:
-        generate_freshness_chart(all_models, date_str)
-
-
-    # --- 4. 保留原始：Active Organizations Ranking ---
+        jobs.append((generate_freshness_chart, (all_models, date_str)))
     orgs = stats.get('top_organizations', {})
     if orgs:
-        df_org = pd.DataFrame(list(orgs.items()), columns=['Organization', 'Count']).sort_values('Count', ascending=True)
-        plt.figure(figsize=(10, 8))
-        plt.barh(df_org['Organization'], df_org['Count'], color='teal')
-        plt.title(f'Active Organizations - {date_str}')
-        plt.tight_layout()
-        plt.savefig(f'org_ranking_{date_str}.png')
-        plt.close()
-
-
-    # --- 5. 新增：生成詞雲 (Word Cloud) ---
+        jobs.append((generate_org_chart, (orgs, date_str)))
     text = " ".join([m.get('id', '').split('/')[-1] for m in all_models])
     if text:
-        wordcloud = WordCloud(width=1200, height=600, background_color='white', 
-                              colormap='viridis', max_words=100).generate(text)
-        plt.figure(figsize=(15, 7.5))
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.axis('off')
-        plt.title(f'Hugging Face Tech Keywords - {date_str}', fontsize=20)
-        plt.tight_layout(pad=0)
-        plt.savefig(f'wordcloud_{date_str}.png')
-        plt.close()
+        jobs.append((generate_wordcloud, (text, date_str)))
+    # 新增：趨勢分析圖
+    jobs.append((generate_trend_chart, (date_str,)))
     
-    # --- 6. 新增：趨勢分析圖 ---
-    generate_trend_chart(date_str)
+    with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as executor:
+        futures = [executor.submit(func, *args) for func, args in jobs]
+        for future in futures:
+            future.result()
 
 
 def generate_freshness_chart(all_models, date_str):
@@ -117,48 +212,33 @@ def generate_freshness_chart(all_models, date_str):
     氣泡大小：Downloads 數量
     顏色：技術類別
     """
-    from datetime import datetime, timezone
-    
-    today = datetime.now(timezone.utc)
-    
-    # 準備數據
+    # 準備數據：單次遍歷收集欄位，時間字串交給 pandas 一次向量化解析
     chart_data = []
     for m in all_models:
         created_at = m.get('created_at') or m.get('lastModified')
-        if not created_at:
+        if not isinstance(created_at, str):
             continue
         
-        try:
-            # 解析創建時間
-            if isinstance(created_at, str):
-                created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
-            else:
-                continue
-            
-            # 計算天數差（新鮮度）
-            days_old = (today - created_date).days
-            if days_old < 0:
-                days_old = 0
-            
-            # 獲取技術類別
-            tech_cat = m.get('tech_category', '其他')
-            tech_cat_en = DISPLAY_LABELS.get(tech_cat, 'Others')
-            
-            chart_data.append({
-                'name': m['id'].split('/')[-1][:20],  # 截斷長名稱
-                'days_old': days_old,
-                'likes': m.get('likes', 0),
-                'downloads': m.get('downloads', 0),
-                'category': tech_cat_en,
-                'full_name': m['id']
-            })
-        except Exception as e:
-            continue
+        # 獲取技術類別
+        tech_cat = m.get('tech_category', '其他')
+        chart_data.append((
+            m['id'].split('/')[-1][:20],  # 截斷長名稱
+            created_at,
+            m.get('likes', 0),
+            m.get('downloads', 0),
+            DISPLAY_LABELS.get(tech_cat, 'Others'),
+        ))
     
     if not chart_data:
         return
     
-    df = pd.DataFrame(chart_data)
+    df = pd.DataFrame(chart_data, columns=['name', 'created_at', 'likes', 'downloads', 'category'])
+    
+    # 解析創建時間，無法解析的丟棄；計算天數差（新鮮度），未來時間視為 0
+    created_date = pd.to_datetime(df['created_at'], utc=True, errors='coerce', format='ISO8601')
+    valid = created_date.notna()
+    days_old = (pd.Timestamp.now(tz='UTC') - created_date[valid]).dt.days.clip(lower=0).astype(int)
+    df = df[valid].assign(days_old=days_old)
     
     # 過濾掉異常數據
     df = df[df['days_old'] <= 365]  # 只顯示一年內的模型
@@ -170,20 +250,31 @@ def generate_freshness_chart(all_models, date_str):
     # 創建圖表
     fig, ax = plt.subplots(figsize=(14, 10))
     
-    # 按類別繪製散點
+    # 所有氣泡一次繪製：依類別首次出現順序穩定排序，疊放順序與逐類別繪製時相同
     categories = df['category'].unique()
+    color_map = {cat: CATEGORY_COLORS.get(cat, _FALLBACK_COLOR) for cat in categories}
+    plot_df = df.iloc[pd.Categorical(df['category'], categories=categories).codes.argsort(kind='stable')]
+    
+    # 氣泡大小基於 downloads，設置最小和最大值
+    sizes = (plot_df['downloads'] / 500).clip(50, 2000)
+    
+    ax.scatter(
+        plot_df['days_old'],
+        plot_df['likes'],
+        s=sizes,
+        c=plot_df['category'].map(color_map).tolist(),
+        alpha=0.6,
+        edgecolors='white',
+        linewidth=0.5
+    )
+    
+    # 圖例用的空散點，大小取該類別氣泡的中間值 (與逐類別繪製時的圖例一致)
+    size_range = sizes.groupby(plot_df['category']).agg(['min', 'max'])
     for cat in categories:
-        cat_df = df[df['category'] == cat]
-        color = CATEGORY_COLORS.get(cat, '#85C1E9')
-        
-        # 氣泡大小基於 downloads，設置最小和最大值
-        sizes = cat_df['downloads'].apply(lambda x: max(50, min(x / 500, 2000)))
-        
         ax.scatter(
-            cat_df['days_old'],
-            cat_df['likes'],
-            s=sizes,
-            c=color,
+            [], [],
+            s=(size_range.at[cat, 'min'] + size_range.at[cat, 'max']) / 2,
+            c=color_map[cat],
             alpha=0.6,
             label=cat,
             edgecolors='white',
@@ -192,10 +283,10 @@ def generate_freshness_chart(all_models, date_str):
     
     # 標註 Top 10 熱門模型名稱
     top_10 = df.nlargest(10, 'likes')
-    for _, row in top_10.iterrows():
+    for row in top_10.itertuples(index=False):
         ax.annotate(
-            row['name'],
-            (row['days_old'], row['likes']),
+            row.name,
+            (row.days_old, row.likes),
             xytext=(5, 5),
             textcoords='offset points',
             fontsize=8,
@@ -232,40 +323,53 @@ def generate_freshness_chart(all_models, date_str):
     )
     
     plt.tight_layout()
-    plt.savefig(f'freshness_chart_{date_str}.png', dpi=150)
+    plt.savefig(f'freshness_chart_{date_str}.png', dpi=150, pil_kwargs=_PNG_PIL_KWARGS)
     plt.close()
 
 
+def load_history_entry(path):
+    try:
+        d = load_json(path)
+        date = d['date']
+        dist = d['statistics'].get('tech_distribution', {})
+        # 僅在趨勢圖中使用英文映射解決亂碼
+        plot_dist = {DISPLAY_LABELS.get(k, k): v for k, v in dist.items()}
+        plot_dist['date'] = date
+        return plot_dist
+    except Exception as e:
+        print(f"Error reading {path}: {e}")
+        return None
+
+
 def generate_trend_chart(current_date):
-    files = sorted(glob.glob("hf_data_*.json"))
-    if len(files) > 30:
-        files = files[-30:]
-        
-    history = []
-    for f in files:
-        try:
-            with open(f, 'r', encoding='utf-8') as j:
-                d = json.load(j)
-                date = d['date']
-                dist = d['statistics'].get('tech_distribution', {})
-                # 僅在趨勢圖中使用英文映射解決亂碼
-                plot_dist = {DISPLAY_LABELS.get(k, k): v for k, v in dist.items()}
-                plot_dist['date'] = date
-                history.append(plot_dist)
-        except Exception as e:
-            print(f"Error reading {f}: {e}")
+    # 只需最近 30 個檔案：單次 scandir 配合大小為 30 的堆積，不必排序整個歸檔目錄
+    with os.scandir('.') as it:
+        files = sorted(heapq.nlargest(30, (
+            entry.name for entry in it
+            if entry.name.startswith('hf_data_') and entry.name.endswith('.json')
+        )))
+    
+    # 歷史檔案彼此獨立，讀檔期間會釋放 GIL，用執行緒池並行載入 (map 保持日期順序)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        history = [h for h in executor.map(load_history_entry, files) if h is not None]
     
     if len(history) > 1:
-        df = pd.DataFrame(history).set_index('date').fillna(0)
+        # 直接組成 (日期 x 類別) 的矩陣，一次 plot 畫出所有類別線，類別順序依首次出現
+        dates = [h['date'] for h in history]
+        cats = list(dict.fromkeys(k for h in history for k in h if k != 'date'))
+        counts = np.array([[h.get(c, 0) for c in cats] for h in history], dtype=float)
         plt.figure(figsize=(12, 6))
-        df.plot(kind='line', marker='o', ax=plt.gca())
+        plt.plot(range(len(dates)), counts, marker='o', label=cats)
+        # x 以序號繪製，刻度由 locator 自動挑選後再顯示對應日期，避免 30 個日期標籤擠在一起
+        plt.gca().xaxis.set_major_formatter(FuncFormatter(
+            lambda x, pos: dates[int(x)] if x == int(x) and 0 <= x < len(dates) else ''))
         plt.title('Technology Trend Analysis (Last 30 Days)')
         plt.ylabel('Model Count')
         plt.xlabel('Date')
         plt.legend(title="Categories", bbox_to_anchor=(1.05, 1), loc='upper left')
         plt.grid(True, linestyle='--', alpha=0.7)
         plt.tight_layout()
-        plt.savefig(f'trend_chart_{current_date}.png')
+        plt.savefig(f'trend_chart_{current_date}.png', pil_kwargs=_PNG_PIL_KWARGS)
         plt.close()
 
 